@@ -1,10 +1,22 @@
 # app.py
+import hashlib
+import hmac
 import os
+import re
+import click
+import sqlite3
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple
 from flask import Flask, render_template, request, redirect, url_for, jsonify, abort
 from models import db, User, Career, Skill, CareerSkillRequirement, UserSkill, Plan, PlanStep, Resource
 from datetime import datetime
-from flask import session, flash
+from flask import session, flash, g, has_request_context
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import insert, inspect, select, text
+from sqlalchemy.orm import selectinload
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 
 # ----------- NEW: Roadmap helpers (pure read-only) -----------
@@ -17,33 +29,39 @@ SKILL_RESOURCES = {
     'figma': ['Figma Learn', 'Build a UI Kit'],
     'design-principles': ['Laws of UX', 'Refactoring UI'],
 }
-def build_roadmap(career_title: str, required_skills: list[str], missing_skills: list[str]) -> list[dict]:
+# joined once at import instead of on every roadmap build
+SKILL_RESOURCES_JOINED = {k: " • ".join(v[:2]) for k, v in SKILL_RESOURCES.items()}
+
+# memoized: args must be hashable (pass tuples); the result is shared between
+# callers, so it is returned as tuples and must not be mutated
+@lru_cache(maxsize=1024)
+def build_roadmap(career_title: str, required_skills: tuple[str, ...], missing_skills: tuple[str, ...]) -> tuple[dict, ...]:
     phases = []
     if missing_skills:
         steps = []
         for s in missing_skills:
-            res = " • ".join(SKILL_RESOURCES.get(s.lower(), [])[:2]) or "Pick a beginner resource"
+            res = SKILL_RESOURCES_JOINED.get(s.lower()) or "Pick a beginner resource"
             steps.append(f"Learn the basics of {s} (2–3 weeks). Suggested: {res}.")
-        phases.append({'title': 'Foundations', 'steps': steps})
-    phases.append({'title': 'Core Practice', 'steps': [
+        phases.append({'title': 'Foundations', 'steps': tuple(steps)})
+    phases.append({'title': 'Core Practice', 'steps': tuple(
         f"Do 3–5 medium practice sets for {s}. Summarize notes in a wiki/notion." for s in required_skills
-    ]})
-    phases.append({'title': 'Projects', 'steps': [
+    )})
+    phases.append({'title': 'Projects', 'steps': (
         "Build Project 1: pick a small scoped idea (2 weeks).",
         "Build Project 2: increase scope, add 1 new concept (APIs, auth, charts, etc.).",
         "Write concise READMEs with screenshots; push everything to GitHub."
-    ]})
-    phases.append({'title': 'Portfolio', 'steps': [
+    )})
+    phases.append({'title': 'Portfolio', 'steps': (
         "Create a clean portfolio page (about, skills, 2 projects, contact).",
         "Polish LinkedIn: headline, summary, skills, project links.",
         "Prepare a 5-minute project walkthrough (story → demo → learning)."
-    ]})
-    phases.append({'title': 'Apply & Iterate', 'steps': [
+    )})
+    phases.append({'title': 'Apply & Iterate', 'steps': (
         "Set a weekly target: 5 tailored applications + 1 coffee chat.",
         "Mock interviews weekly; log weak areas and revisit notes.",
         "Iterate projects based on feedback; ship small improvements weekly."
-    ]})
-    return phases
+    )})
+    return tuple(phases)
 # ----------- end roadmap helpers -----------
 
 # keep using templates only (no static folder)
@@ -53,16 +71,390 @@ app = Flask(__name__, template_folder=TEMPLATES_DIR, static_folder=None)
 
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(BASE_DIR, 'data.sqlite')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# pooled connections so concurrent requests don't serialize on one connection
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_pre_ping': True,
+    'connect_args': {'check_same_thread': False, 'timeout': 30},
+}
 app.secret_key = 'dev-secret'  # change for production
 
 db.init_app(app)
 
-# helper to parse comma separated list
+# ----------- NEW: SQLite tuning (WAL + relaxed fsync) -----------
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",       # readers no longer block behind writers
+    "synchronous=NORMAL",     # safe with WAL; no fsync on every commit
+    "temp_store=MEMORY",
+    "cache_size=-20000",      # ~20 MB page cache
+    "mmap_size=268435456",    # 256 MB
+    "foreign_keys=ON",
+)
+
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cur = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cur.execute("PRAGMA " + pragma)
+    cur.close()
+# -----------------------------------------------
+
+# ----------- NEW: view-level response cache (optional, pip install Flask-Caching) -----------
+try:
+    from flask_caching import Cache
+    cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 300})
+except ImportError:
+    cache = None
+
+def cached_view(**kwargs):
+    # no-op decorator when Flask-Caching is not installed
+    if cache is None:
+        return lambda view: view
+    return cache.cached(**kwargs)
+
+def _page_is_personalized():
+    # never cache/serve a shared copy for logged-in users or pages with pending flashes
+    return 'user_id' in session or '_flashes' in session
+# -----------------------------------------------
+
+# ----------- NEW: gzip/br response compression (optional, pip install Flask-Compress) -----------
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html']
+app.config['COMPRESS_LEVEL'] = 5
+app.config['COMPRESS_MIN_SIZE'] = 500  # bytes; tiny bodies aren't worth the CPU
+try:
+    from flask_compress import Compress
+    Compress(app)
+except ImportError:
+    pass
+# -----------------------------------------------
+
+# ----------- NEW: fast JSON responses (optional, pip install orjson) -----------
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_response(data):
+    # orjson serializes straight to bytes; falls back to jsonify without it
+    if orjson is None:
+        return jsonify(data)
+    return app.response_class(orjson.dumps(data), mimetype='application/json')
+# -----------------------------------------------
+
+# ----------- NEW: per-request query log + N+1 detector (debug only) -----------
+# the same statement run this many times in one request is reported as a likely N+1
+app.config.setdefault('DB_QUERY_LOG_N1_THRESHOLD', 3)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _query_log_start(conn, cursor, statement, parameters, context, executemany):
+    if app.debug and has_request_context():
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _query_log_stop(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('query_start')
+    if starts and has_request_context():
+        g.setdefault('queries', []).append((statement, time.perf_counter() - starts.pop()))
+
+@app.after_request
+def _log_query_summary(response):
+    queries = g.pop('queries', None)
+    if not queries:
+        return response
+    threshold = app.config['DB_QUERY_LOG_N1_THRESHOLD']
+    statement, repeats = Counter(stmt for stmt, _ in queries).most_common(1)[0]
+    total_ms = sum(duration for _, duration in queries) * 1000
+    if repeats >= threshold:
+        app.logger.warning("%s %s: %d queries (%.1f ms), possible N+1 - ran %d times: %s",
+                           request.method, request.path, len(queries), total_ms, repeats, statement)
+    elif len(queries) > threshold:
+        app.logger.info("%s %s: %d queries (%.1f ms)", request.method, request.path, len(queries), total_ms)
+    return response
+# -----------------------------------------------
+
+# ----------- NEW: opt-in cProfile per request: PROFILE=1 flask run -----------
+# Writes one .prof per request (open with snakeviz/tuna). Never enable in production.
+if os.environ.get('PROFILE'):
+    from werkzeug.middleware.profiler import ProfilerMiddleware
+    PROFILE_DIR = os.path.join(BASE_DIR, 'profiler_results')
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    app.wsgi_app = ProfilerMiddleware(app.wsgi_app, profile_dir=PROFILE_DIR, restrictions=[30])
+# -----------------------------------------------
+
+# ----------- NEW: opt-in N+1 detection: NPLUSONE=1 flask run (pip install nplusone) -----------
+# nplusone patches SQLAlchemy internals, so it never loads unless asked for, and a
+# version mismatch (it fails on SQLAlchemy 2.x) only costs the detector, not the app
+if os.environ.get('NPLUSONE'):
+    try:
+        from nplusone.ext.flask_sqlalchemy import NPlusOne
+        NPlusOne(app)
+    except Exception as e:
+        app.logger.warning("nplusone N+1 detection unavailable: %s", e)
+# -----------------------------------------------
+
+# helper to parse comma separated list (separator regex compiled once)
+_CSV_RE = re.compile(r'\s*,\s*')
+
 def split_csv(value):
-    return [s.strip() for s in (value or '').split(',') if s.strip()]
+    return [s for s in _CSV_RE.split((value or '').strip()) if s]
+
+# ----------- NEW: in-memory career catalog -----------
+# Careers + their required skills are read-only reference data, so /recommend
+# scores against this cached index instead of querying the catalog per request.
+# Freshness is checked per request against catalog_version, a one-row counter that
+# triggers bump on every write to careers / career_skills / skills. It lives in the
+# database, so writes from other workers, seed_db.py or a reset are seen too.
+class CareerCatalog(NamedTuple):
+    # one immutable snapshot: positions in the indexes always refer to this `entries`
+    version: object  # catalog_version it was built at (None: database has no counter)
+    entries: tuple
+    title_ngrams: dict  # every 1..3-char substring of title_lower -> {position}
+    skills: dict        # required skill (lowercased) -> {position}
+
+# swapped as a whole by _load_career_index(); request threads keep the snapshot they took
+CAREER_CATALOG = CareerCatalog(-1, (), {}, {})
+
+CATALOG_VERSION_DDL = (
+    "CREATE TABLE IF NOT EXISTS catalog_version ("
+    "id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)",
+) + tuple(
+    f"CREATE TRIGGER IF NOT EXISTS {table}_catalog_{op.lower()} AFTER {op} ON {table} BEGIN "
+    "UPDATE catalog_version SET version = version + 1; END"
+    for table in ('careers', 'career_skills', 'skills')
+    for op in ('INSERT', 'UPDATE', 'DELETE')
+)
+CATALOG_VERSIONED = None  # None until checked: does catalog_version exist in this database?
+
+def _catalog_db_version():
+    # None if the counter was never created (init-db not run): the catalog is then
+    # reloaded on every request, which is always correct, just not cached
+    global CATALOG_VERSIONED
+    if CATALOG_VERSIONED is None:
+        CATALOG_VERSIONED = db.engine.dialect.name == 'sqlite' and db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'catalog_version'")
+        ).first() is not None
+    if not CATALOG_VERSIONED:
+        return None
+    return db.session.execute(text("SELECT version FROM catalog_version WHERE id = 1")).scalar()
+
+def _title_ngrams(text, n_max=3):
+    return {text[i:i + n] for n in range(1, n_max + 1) for i in range(len(text) - n + 1)}
+
+def _load_career_index(version):
+    global CAREER_CATALOG
+    careers = db.session.execute(
+        select(Career).options(selectinload(Career.requirements).joinedload(CareerSkillRequirement.skill))
+    ).scalars().all()
+    index = []
+    for c in careers:
+        reqs = [req.skill.name.lower() for req in c.requirements if req.skill and req.skill.name]
+        index.append({
+            'id': c.id,
+            'title': c.title,
+            'title_lower': (c.title or '').lower(),
+            'reqs_lower': frozenset(reqs),
+            'reqs_display': reqs,
+        })
+    ngrams, skills = {}, {}
+    for pos, entry in enumerate(index):
+        for gram in _title_ngrams(entry['title_lower']):
+            ngrams.setdefault(gram, set()).add(pos)
+        for skill in entry['reqs_lower']:
+            skills.setdefault(skill, set()).add(pos)
+    catalog = CareerCatalog(version, tuple(index), ngrams, skills)
+    CAREER_CATALOG = catalog  # single assignment: readers never see a half-built catalog
+    return catalog
+
+def get_career_index():
+    version = _catalog_db_version()
+    catalog = CAREER_CATALOG
+    if version is None or catalog.version != version:
+        catalog = _load_career_index(version)
+    return catalog
+
+def careers_matching_interest(catalog, interest):
+    # positions in `catalog` of careers whose title contains `interest` (same result as a substring scan)
+    grams = [interest[i:i + 3] for i in range(len(interest) - 2)] or [interest]
+    hits = set.intersection(*(catalog.title_ngrams.get(g, set()) for g in grams))
+    if len(interest) <= 3:
+        return hits  # every substring this short is indexed directly
+    # sharing all 3-grams is necessary but not sufficient; confirm the few survivors
+    return {pos for pos in hits if interest in catalog.entries[pos]['title_lower']}
+# -----------------------------------------------
 
-with app.app_context():
+# create_all() skips tables that already exist, so indexes added to models.py
+# later would never reach an existing data.sqlite; create any missing ones here
+def _ensure_indexes():
+    for table in db.metadata.sorted_tables:
+        for idx in table.indexes:
+            idx.create(bind=db.engine, checkfirst=True)
+
+# careers.avg_salary (Numeric) became avg_salary_cents (Integer); create_all() won't
+# add a column to an existing table, so add it and carry the old values over once
+def _migrate_salary_cents():
+    with db.engine.begin() as conn:
+        cols = {c['name'] for c in inspect(conn).get_columns('careers')}
+        if 'avg_salary_cents' in cols:
+            return
+        conn.execute(text("ALTER TABLE careers ADD COLUMN avg_salary_cents INTEGER"))
+        if 'avg_salary' in cols:
+            conn.execute(text(
+                "UPDATE careers SET avg_salary_cents = CAST(ROUND(avg_salary * 100) AS INTEGER) "
+                "WHERE avg_salary IS NOT NULL"
+            ))
+
+# created_at is filled in by the database (server_default=func.now()). SQLite can't add
+# a DEFAULT to an existing column, so tables created before that get an AFTER INSERT
+# trigger doing the same thing instead
+def _ensure_created_at_defaults():
+    if db.engine.dialect.name != 'sqlite':
+        return
+    with db.engine.begin() as conn:
+        insp = inspect(conn)
+        for table in db.metadata.sorted_tables:
+            if 'created_at' not in table.c:
+                continue
+            live = {c['name']: c for c in insp.get_columns(table.name)}
+            if live['created_at']['default'] is not None:
+                continue
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {table.name}_created_at_default "
+                f"AFTER INSERT ON {table.name} WHEN new.created_at IS NULL BEGIN "
+                f"UPDATE {table.name} SET created_at = CURRENT_TIMESTAMP WHERE rowid = new.rowid; END"
+            ))
+
+# ----------- NEW: FTS5 career title search -----------
+# A leading-wildcard LIKE can't use an index. A trigram FTS5 table answers the same
+# substring question (case-insensitive) from an index; it needs 3+ chars per query.
+CAREER_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS careers_fts USING fts5("
+    "title, content='careers', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS careers_fts_ai AFTER INSERT ON careers BEGIN "
+    "INSERT INTO careers_fts(rowid, title) VALUES (new.id, new.title); END",
+    "CREATE TRIGGER IF NOT EXISTS careers_fts_ad AFTER DELETE ON careers BEGIN "
+    "INSERT INTO careers_fts(careers_fts, rowid, title) VALUES ('delete', old.id, old.title); END",
+    "CREATE TRIGGER IF NOT EXISTS careers_fts_au AFTER UPDATE ON careers BEGIN "
+    "INSERT INTO careers_fts(careers_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+    "INSERT INTO careers_fts(rowid, title) VALUES (new.id, new.title); END",
+    # resync in case careers was dropped/recreated (e.g. by the reset scripts) since last run
+    "INSERT INTO careers_fts(careers_fts) VALUES ('rebuild')",
+)
+CAREER_FTS = None  # None until checked: does careers_fts exist in this database?
+
+def _ensure_catalog_version():
+    global CATALOG_VERSIONED
+    if db.engine.dialect.name != 'sqlite':
+        CATALOG_VERSIONED = False
+        return
+    with db.engine.begin() as conn:
+        for ddl in CATALOG_VERSION_DDL:
+            conn.execute(text(ddl))
+    CATALOG_VERSIONED = True
+
+def _ensure_career_fts():
+    global CAREER_FTS
+    if db.engine.dialect.name != 'sqlite':
+        CAREER_FTS = False
+        return
+    try:
+        with db.engine.begin() as conn:
+            for ddl in CAREER_FTS_DDL:
+                conn.execute(text(ddl))
+        CAREER_FTS = True
+    except Exception as e:
+        CAREER_FTS = False
+        app.logger.warning("FTS5 trigram search unavailable, using LIKE: %s", e)
+
+def _career_fts_available():
+    # created by `flask init-db`; databases that never ran it fall back to LIKE
+    global CAREER_FTS
+    if CAREER_FTS is None:
+        CAREER_FTS = db.engine.dialect.name == 'sqlite' and db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'careers_fts'")
+        ).first() is not None
+    return CAREER_FTS
+
+def find_career(query):
+    # first career (by id) whose title contains `query`, case-insensitive
+    if len(query) >= 3 and _career_fts_available():
+        return db.session.execute(text(
+            "SELECT c.id, c.title FROM careers c JOIN careers_fts f ON f.rowid = c.id "
+            "WHERE careers_fts MATCH :q ORDER BY c.id LIMIT 1"
+        ), {'q': '"' + query.replace('"', '""') + '"'}).first()
+    return db.session.execute(
+        select(Career.id, Career.title)
+        .where(Career.title.ilike(f'%{query}%'))
+        .order_by(Career.id)
+        .limit(1)
+    ).first()
+# -----------------------------------------------
+
+# ----------- NEW: schema setup as a CLI command -----------
+# Importing app.py only configures the engine; schema work runs once per deploy
+# via `flask --app app init-db` (idempotent) instead of on every worker boot.
+# The career index is loaded lazily on the first /recommend.
+def init_db():
     db.create_all()
+    _migrate_salary_cents()
+    _ensure_created_at_defaults()
+    _ensure_indexes()
+    _ensure_career_fts()
+    _ensure_catalog_version()
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create tables, indexes and the career search index."""
+    init_db()
+    click.echo('Database initialized at ' + app.config['SQLALCHEMY_DATABASE_URI'])
+
+# Resets (reset_db.py, seed_db.py --reset) only need empty tables. When the last
+# reset rebuilt the schema from the current models, DELETE every row in one transaction
+# instead of dropping and recreating it. schema_version holds the hash of the models the
+# schema was built from; only reset_db() writes it, right after drop_all() + init_db(),
+# because init_db()'s create_all() never alters tables that already exist.
+SCHEMA_VERSION_DDL = "CREATE TABLE IF NOT EXISTS schema_version (hash TEXT NOT NULL)"
+
+def _schema_hash():
+    dialect = db.engine.dialect
+    ddl = []
+    for table in db.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        ddl.extend(str(CreateIndex(idx).compile(dialect=dialect))
+                   for idx in sorted(table.indexes, key=lambda i: i.name))
+    ddl.extend(CAREER_FTS_DDL)
+    ddl.extend(CATALOG_VERSION_DDL)
+    return hashlib.sha256('\n'.join(ddl).encode()).hexdigest()
+
+def _record_schema_hash():
+    with db.engine.begin() as conn:
+        conn.execute(text(SCHEMA_VERSION_DDL))
+        conn.execute(text("DELETE FROM schema_version"))
+        conn.execute(text("INSERT INTO schema_version (hash) VALUES (:h)"), {'h': _schema_hash()})
+
+def fast_reset():
+    """Empty every table if the schema matches the models; return False if it doesn't."""
+    with db.engine.begin() as conn:
+        conn.execute(text(SCHEMA_VERSION_DDL))
+        if conn.execute(text("SELECT hash FROM schema_version")).scalar() != _schema_hash():
+            return False
+        for table in reversed(db.metadata.sorted_tables):
+            conn.execute(table.delete())
+    return True
+
+def reset_db():
+    """Empty the database, rebuilding the schema only when the models changed."""
+    if not fast_reset():
+        db.drop_all()
+        init_db()
+        _record_schema_hash()
+# -----------------------------------------------
 
 # ----------- NEW: IntegrityError handling -----------
 from sqlalchemy.exc import IntegrityError
@@ -81,6 +473,7 @@ def handle_integrity_error(err):
 # -----------------------------------------------
 
 @app.route('/')
+@cached_view(unless=_page_is_personalized)
 def index():
     return render_template('index.html')
 
@@ -110,22 +503,19 @@ def profile():
         user.interests = interests
         user.skills_text = skills
 
-        db.session.commit()
-
         # ✅ Update user skills table
         # First, clear old user_skills to avoid duplicates
         UserSkill.query.filter_by(user_id=user.id).delete()
-        db.session.commit()
 
-        # Then, add new skills
-        for s in split_csv(skills):
-            sk = Skill.query.filter_by(name=s.lower()).first()
-            us = UserSkill(user_id=user.id, skill_id=sk.id if sk else None, name=s)
-            try:
-                db.session.add(us)
-                db.session.commit()
-            except IntegrityError:
-                db.session.rollback()
+        # Then, add new skills: resolve all skill ids with one IN query
+        tokens = split_csv(skills)
+        rows = Skill.query.filter(Skill.name.in_([s.lower() for s in tokens])).all() if tokens else []
+        skill_ids = {r.name: r.id for r in rows}
+        db.session.add_all([
+            UserSkill(user_id=user.id, skill_id=skill_ids.get(s.lower()), name=s) for s in tokens
+        ])
+        # profile update, delete and inserts all land in a single transaction
+        db.session.commit()
 
         return redirect(url_for('recommend', user_id=user.id))
 
@@ -148,36 +538,35 @@ def recommend(user_id):
         pass
     # -----------------------------------------------
 
-    user = User.query.get_or_404(user_id)
+    user = db.session.get(User, user_id, options=[selectinload(User.skills)]) or abort(404)
 
-    # get user's skills set (lowercased)
-    user_skills = {s.name.lower() for s in user.skills if s.name} if user.skills else set()
-    # fallback to skills_text
-    if not user_skills and user.skills_text:
-        user_skills = set([x.lower() for x in split_csv(user.skills_text)])
+    # get user's skills set (lowercased, falls back to skills_text)
+    user_skills = user.normalized_skills
 
     # simple rule: find careers that share keywords in user's interests OR have overlapping required skills
-    interests = split_csv(user.interests)
-    interest_lower = [i.lower() for i in interests]
-
-    # collect candidate careers
-    candidates = []
-    for career in Career.query.all():
-        score = 0
+    interest_lower = [i.lower() for i in split_csv(user.interests)]
+
+    # collect candidate careers from the cached catalog (no DB access):
+    # only careers hit by the title or skill indexes are scored
+    catalog = get_career_index()  # one snapshot for the whole request
+    career_index = catalog.entries
+    interest_scores = {}
+    for it in interest_lower:
         # match by interest keyword in career title
-        for it in interest_lower:
-            if it in (career.title or '').lower():
-                score += 1.0
+        for pos in careers_matching_interest(catalog, it):
+            interest_scores[pos] = interest_scores.get(pos, 0) + 1.0
+    skill_hits = set().union(*(catalog.skills.get(s, ()) for s in user_skills))
+    candidates = []
+    for pos in sorted(interest_scores.keys() | skill_hits):  # catalog order keeps ties stable
+        career = career_index[pos]
         # match by overlapping skills
-        reqs = [req.skill.name.lower() for req in career.requirements if req.skill and req.skill.name]
-        overlap = len(set(reqs) & user_skills)
-        score += overlap * 0.8
-        if score > 0 or overlap > 0:
-            candidates.append((career, reqs, score))
+        overlap = len(career['reqs_lower'] & user_skills)
+        score = interest_scores.get(pos, 0) + overlap * 0.8
+        candidates.append((career, career['reqs_display'], score))
 
     # if none found, fallback to top careers
     if not candidates:
-        candidates = [(c, [req.skill.name for req in c.requirements if req.skill], 0) for c in Career.query.limit(5).all()]
+        candidates = [(c, c['reqs_display'], 0) for c in career_index[:5]]
 
     # sort candidates by score desc
     candidates.sort(key=lambda x: x[2], reverse=True)
@@ -188,34 +577,46 @@ def recommend(user_id):
     roadmaps = {}  # NEW
     for career, reqs, _ in candidates:
         required_skills = [s for s in reqs]
-        recs.append({'career': career.title, 'skills': required_skills})
+        recs.append({'career': career['title'], 'skills': required_skills})
         missing = [r for r in required_skills if r.lower() not in user_skills]
-        gaps[career.title] = missing
-        roadmaps[career.title] = build_roadmap(career.title, required_skills, missing)  # NEW
+        gaps[career['title']] = missing
+        roadmaps[career['title']] = build_roadmap(career['title'], tuple(required_skills), tuple(missing))  # NEW
 
     return render_template('recommend.html', user=user, recs=recs, gaps=gaps, roadmaps=roadmaps)  # +roadmaps
 
 @app.route('/save_plan/<int:user_id>', methods=['POST'])
 def save_plan(user_id):
-    user = User.query.get_or_404(user_id)
-    career_title = request.form.get('career') or request.json and request.json.get('career')
+    user = db.session.get(User, user_id) or abort(404)
+    # parse a JSON body at most once, and only when the client sent JSON
+    payload = request.get_json(silent=True) if request.is_json else None
+    career_title = request.form.get('career') or (payload.get('career') if isinstance(payload, dict) else None)
     if not career_title:
         return jsonify({'success': False, 'message': 'Career required'}), 400
 
     try:
         # find or create career entry
-        career = Career.query.filter(Career.title == career_title).first()
+        career = db.session.execute(
+            select(Career)
+            .options(selectinload(Career.requirements).joinedload(CareerSkillRequirement.skill))
+            .where(Career.title == career_title)
+        ).scalars().first()
         if career is None:
             career = Career(title=career_title)
             db.session.add(career)
-            db.session.commit()
+            db.session.commit()  # bumps catalog_version, so every worker reloads its catalog
     except IntegrityError as e:
         db.session.rollback()
         return jsonify({'success': False, 'message': f'Could not create career: {e.orig}'}), 400
 
+    # read the eager-loaded requirements once, before the commit below expires `career`
+    required = [req.skill.name.lower() for req in career.requirements if req.skill]
+    career_title = career.title
+
     try:
-        plan = Plan(user_id=user.id, career_id=career.id, title=f'Roadmap for {career.title}')
+        plan = Plan(user_id=user.id, career_id=career.id, title=f'Roadmap for {career_title}')
         db.session.add(plan)
+        db.session.flush()
+        plan_id = plan.id  # read before commit() expires it
         db.session.commit()
     except IntegrityError as e:
         db.session.rollback()
@@ -225,52 +626,42 @@ def save_plan(user_id):
     # create simple default steps for missing skills
     missing = request.form.getlist('missing') or []
     if not missing:
-        reqs = [req.skill.name.lower() for req in career.requirements if req.skill]
-        user_skills = set([s.name.lower() for s in user.user_skills if s.name]) or set([x.lower() for x in split_csv(user.skills_text)])
-        missing = [r for r in reqs if r.lower() not in user_skills]
+        user_skills = user.normalized_skills
+        missing = [r for r in required if r.lower() not in user_skills]
 
     # NEW: build & persist roadmap steps
-    required = [req.skill.name.lower() for req in career.requirements if req.skill]
-    phases = build_roadmap(career.title, required, missing)
-
-    order = 1
-    for ph in phases:
-        for step in ph['steps']:
-            try:
-                db.session.add(PlanStep(plan_id=plan.id, title=f"{ph['title']}: {step}", sort_order=order))
-                db.session.commit()
-                order += 1
-            except IntegrityError:
-                db.session.rollback()  # skip duplicate step titles/order if any and continue
-
+    phases = build_roadmap(career_title, tuple(required), tuple(missing))
+
+    # all steps in one executemany INSERT (step ids are never read, so no RETURNING per row)
+    # and one commit; an IntegrityError rolls back via the app errorhandler
+    steps = [
+        {'plan_id': plan_id, 'title': f"{ph['title']}: {step}", 'sort_order': order}
+        for order, (ph, step) in enumerate(((ph, step) for ph in phases for step in ph['steps']), start=1)
+    ]
     # keep your original extra project step (harmless if similar)
-    try:
-        db.session.add(PlanStep(plan_id=plan.id, title='Build a small project to demonstrate skills', sort_order=order))
-        db.session.commit()
-    except IntegrityError:
-        db.session.rollback()
+    steps.append({'plan_id': plan_id, 'title': 'Build a small project to demonstrate skills', 'sort_order': len(steps) + 1})
+    db.session.execute(insert(PlanStep), steps)
+    db.session.commit()
 
-    return jsonify({'success': True, 'message': f'Plan saved for {career.title}', 'plan_id': plan.id})
+    return jsonify({'success': True, 'message': f'Plan saved for {career_title}', 'plan_id': plan_id})
 
 @app.route('/resources')
 def resources():
     career_query = request.args.get('career','').strip()
     if career_query:
-        career = Career.query.filter(Career.title.ilike(f'%{career_query}%')).first()
+        career = find_career(career_query)
         if career:
-            res = set()
-            for r in career.resources:
-                res.add((r.title, r.url))
-            for req in career.requirements:
-                for r in req.skill.resources:
-                    res.add((r.title, r.url))
-            out = [{'title': t, 'url': u} for t,u in res]
-            return jsonify({'career': career.title, 'resources': out})
+            # dedupe in SQL; resources link to careers only (there is no skill->resource table)
+            rows = db.session.execute(
+                select(Resource.title, Resource.url).where(Resource.career_id == career.id).distinct()
+            ).all()
+            out = [{'title': t, 'url': u} for t, u in rows]
+            return json_response({'career': career.title, 'resources': out})
         else:
-            return jsonify({'career': career_query, 'resources': []})
-    resources = Resource.query.limit(20).all()
-    out = [{'title': r.title, 'url': r.url} for r in resources]
-    return jsonify({'resources': out})
+            return json_response({'career': career_query, 'resources': []})
+    rows = db.session.execute(select(Resource.title, Resource.url).limit(20)).all()
+    out = [{'title': t, 'url': u} for t, u in rows]
+    return json_response({'resources': out})
 
 @app.route('/debug/users')
 def debug_users():
@@ -279,6 +670,31 @@ def debug_users():
 
 # -------------------- AUTH ROUTES --------------------
 
+# ----------- NEW: short-lived cache of successful password checks -----------
+# Re-logins with the same credentials within the TTL skip the slow KDF. Keys are
+# HMACs (never plaintext) and include the stored hash, so a password change
+# invalidates them. Failed checks are never cached.
+LOGIN_CACHE_TTL = 60  # seconds
+LOGIN_CACHE_MAX = 1000
+_verified_logins = {}  # hmac digest -> expiry (time.monotonic())
+
+def verify_password(email, password, password_hash):
+    key = hmac.new(app.secret_key.encode(), '\0'.join((email, password, password_hash)).encode(), 'sha256').digest()
+    now = time.monotonic()
+    if _verified_logins.get(key, 0) > now:
+        return True
+    if not check_password_hash(password_hash, password):
+        return False
+    if len(_verified_logins) >= LOGIN_CACHE_MAX:
+        for k, expiry in list(_verified_logins.items()):
+            if expiry <= now:
+                _verified_logins.pop(k, None)
+        if len(_verified_logins) >= LOGIN_CACHE_MAX:
+            _verified_logins.clear()
+    _verified_logins[key] = now + LOGIN_CACHE_TTL
+    return True
+# -----------------------------------------------
+
 @app.route('/register', methods=['GET', 'POST'])
 def register():
     if request.method == 'POST':
@@ -296,7 +712,7 @@ def register():
             return redirect(url_for('login'))
 
         # create new user
-        hashed_password = generate_password_hash(password)
+        hashed_password = generate_password_hash(password, method='scrypt')
         new_user = User(name=name, email=email, password_hash=hashed_password)
         db.session.add(new_user)
         db.session.commit()
@@ -323,7 +739,7 @@ def signup():
             flash("Email already registered. Please log in.")
             return redirect(url_for('login'))
 
-        hashed_pw = generate_password_hash(password)
+        hashed_pw = generate_password_hash(password, method='scrypt')
         new_user = User(name=name, email=email, password_hash=hashed_pw)
 
         db.session.add(new_user)
@@ -342,7 +758,7 @@ def login():
         password = request.form['password']
 
         user = User.query.filter_by(email=email).first()
-        if user and check_password_hash(user.password_hash, password):
+        if user and user.password_hash and verify_password(email, password, user.password_hash):
             session['user_id'] = user.id
             session['user_name'] = user.name
             return redirect(url_for('profile'))
@@ -360,5 +776,14 @@ def logout():
 
 
 if __name__ == '__main__':
-    # Pin to localhost:5000 explicitly (no change for linkage)
-    app.run(host='127.0.0.1', port=5000, debug=True)
+    # Werkzeug dev server is for local development only (run_app.bat sets FLASK_ENV).
+    # In production serve through gunicorn: gunicorn -c gunicorn_conf.py wsgi:app
+    if os.environ.get('FLASK_ENV') == 'development':
+        # dev convenience: make sure the schema exists before serving
+        with app.app_context():
+            init_db()
+        # Pin to localhost:5000 explicitly (no change for linkage)
+        app.run(host='127.0.0.1', port=5000, debug=True)
+    else:
+        print("Set FLASK_ENV=development to use the dev server, "
+              "or run: gunicorn -c gunicorn_conf.py wsgi:app")
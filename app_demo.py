@@ -3,6 +3,7 @@ import os
 from flask import Flask, render_template, request, redirect, url_for, jsonify, abort
 from models import db, User, Career, Skill, CareerSkillRequirement, UserSkill, Plan, PlanStep, Resource
 from datetime import datetime
+from sqlalchemy.orm import selectinload
 
 # ---------- Roadmap helpers (added) ----------
 SKILL_RESOURCES = {
@@ -107,10 +108,10 @@ def profile():
 
 @app.route('/recommend/<int:user_id>')
 def recommend(user_id):
-    user = User.query.get_or_404(user_id)
+    user = User.query.options(selectinload(User.skills)).get_or_404(user_id)
 
     # get user's skills set (lowercased)
-    user_skills = {s.name.lower() for s in user.user_skills if s.name} if user.user_skills else set()
+    user_skills = {s.name.lower() for s in user.skills if s.name} if user.skills else set()
     # fallback to skills_text
     if not user_skills and user.skills_text:
         user_skills = set([x.lower() for x in split_csv(user.skills_text)])
@@ -119,9 +120,12 @@ def recommend(user_id):
     interests = split_csv(user.interests)
     interest_lower = [i.lower() for i in interests]
 
-    # collect candidate careers
+    # collect candidate careers (requirements + skills eager-loaded: 2 queries instead of N+1)
+    careers = Career.query.options(
+        selectinload(Career.requirements).joinedload(CareerSkillRequirement.skill)
+    ).all()
     candidates = []
-    for career in Career.query.all():
+    for career in careers:
         score = 0
         # match by interest keyword in career title
         for it in interest_lower:
@@ -136,7 +140,7 @@ def recommend(user_id):
 
     # if none found, fallback to top careers
     if not candidates:
-        candidates = [(c, [req.skill.name for req in c.requirements if req.skill], 0) for c in Career.query.limit(5).all()]
+        candidates = [(c, [req.skill.name for req in c.requirements if req.skill], 0) for c in careers[:5]]
 
     # sort candidates by score desc
     candidates.sort(key=lambda x: x[2], reverse=True)
@@ -204,7 +208,10 @@ def save_plan(user_id):
 def resources():
     career_query = request.args.get('career','').strip()
     if career_query:
-        career = Career.query.filter(Career.title.ilike(f'%{career_query}%')).first()
+        career = Career.query.options(
+            selectinload(Career.resources),
+            selectinload(Career.requirements).joinedload(CareerSkillRequirement.skill),
+        ).filter(Career.title.ilike(f'%{career_query}%')).first()
         if career:
             # gather resources associated with career or with required skills
             res = set()
@@ -212,7 +219,8 @@ def resources():
                 res.add((r.title, r.url))
             # resources via skills
             for req in career.requirements:
-                for r in req.skill.resources:
+                # Skill has no resources relationship; tolerate its absence
+                for r in getattr(req.skill, 'resources', ()):
                     res.add((r.title, r.url))
             out = [{'title': t, 'url': u} for t,u in res]
             return jsonify({'career': career.title, 'resources': out})
@@ -0,0 +1,21 @@
+# gunicorn_conf.py
+# Usage: gunicorn -c gunicorn_conf.py wsgi:app
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# threaded workers: the ORM calls block, so gevent would need monkey-patching
+worker_class = 'gthread'
+threads = 4
+keepalive = 5
+# import app.py once in the master, then fork (schema setup is `flask --app app init-db`)
+preload_app = True
+
+
+def post_fork(server, worker):
+    # connections opened in the master during preload must not be shared by forked workers
+    from app import app
+    from models import db
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -1,6 +1,8 @@
 # models.py
-from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import func
+from sqlalchemy.ext.hybrid import hybrid_property
+from werkzeug.utils import cached_property
 
 db = SQLAlchemy()
 
@@ -17,10 +19,10 @@ class User(db.Model):
     interests = db.Column(db.Text, nullable=True)
     skills_text = db.Column(db.Text, nullable=True)
 
-    email = db.Column(db.String(255), unique=True, nullable=True)
+    email = db.Column(db.String(255), unique=True, nullable=True)  # UNIQUE already backs login lookups with an index
     password_hash = db.Column(db.String(255), nullable=True)
     role = db.Column(db.String(50), nullable=True)
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
     last_login = db.Column(db.DateTime(timezone=True))
     is_active = db.Column(db.Boolean, default=True)
 
@@ -28,6 +30,12 @@ class User(db.Model):
     skills = db.relationship("UserSkill", back_populates="user", cascade="all, delete-orphan")
     plans = db.relationship("Plan", back_populates="user", cascade="all, delete-orphan")
 
+    @cached_property
+    def normalized_skills(self):
+        # lowercased skill names (falls back to skills_text); computed once per instance/request
+        return ({s.name.lower() for s in self.skills if s.name}
+                or {x.strip().lower() for x in (self.skills_text or '').split(',') if x.strip()})
+
 class Profile(db.Model):
     __tablename__ = 'profiles'
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
@@ -54,9 +62,12 @@ class Skill(db.Model):
 
 class UserSkill(db.Model):
     __tablename__ = 'user_skills'
+    __table_args__ = (
+        db.Index('ix_userskill_user_skill', 'user_id', 'skill_id'),
+    )
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  # led by ix_userskill_user_skill
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), nullable=True, index=True)
     name = db.Column(db.String(255))  # textual fallback if skill_id is None
     proficiency_level = db.Column(db.String(50))
     years_experience = db.Column(db.Integer)
@@ -71,23 +82,41 @@ class UserSkill(db.Model):
 class Career(db.Model):
     __tablename__ = 'careers'
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    title = db.Column(db.String(255), nullable=False)
+    title = db.Column(db.String(255), nullable=False, index=True)
     description = db.Column(db.Text)
     category = db.Column(db.String(100))
-    avg_salary = db.Column(db.Numeric)
+    # whole cents as an int: no Decimal built per row on load (see avg_salary below)
+    avg_salary_cents = db.Column(db.Integer)
     growth_rate = db.Column(db.Float)
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
 
-    requirements = db.relationship("CareerSkillRequirement", back_populates="career", cascade="all, delete-orphan")
+    requirements = db.relationship("CareerSkillRequirement", back_populates="career", cascade="all, delete-orphan", order_by="CareerSkillRequirement.id")
     resources = db.relationship("Resource", back_populates="career", cascade="all, delete-orphan")
     plans = db.relationship("Plan", back_populates="career", cascade="all, delete-orphan")
 
+    @hybrid_property
+    def avg_salary(self):
+        return self.avg_salary_cents / 100 if self.avg_salary_cents is not None else None
+
+    @avg_salary.setter
+    def avg_salary(self, value):
+        self.avg_salary_cents = round(value * 100) if value is not None else None
+
+    @avg_salary.expression
+    def avg_salary(cls):
+        return cls.avg_salary_cents / 100.0
+
 
 class CareerSkillRequirement(db.Model):
     __tablename__ = 'career_skills'
+    __table_args__ = (
+        # one row per (career, skill); a unique index (not a table constraint) so
+        # _ensure_indexes() can add it to existing databases too
+        db.Index('uq_career_skill', 'career_id', 'skill_id', unique=True),
+    )
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    career_id = db.Column(db.Integer, db.ForeignKey('careers.id'), nullable=False)
-    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), nullable=False)
+    career_id = db.Column(db.Integer, db.ForeignKey('careers.id'), nullable=False)  # led by uq_career_skill
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), nullable=False, index=True)
     importance_level = db.Column(db.String(50))
 
     career = db.relationship("Career", back_populates="requirements")
@@ -100,20 +129,21 @@ class CareerSkillRequirement(db.Model):
 class Plan(db.Model):
     __tablename__ = 'plans'
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    career_id = db.Column(db.Integer, db.ForeignKey('careers.id'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    career_id = db.Column(db.Integer, db.ForeignKey('careers.id'), nullable=True, index=True)
     title = db.Column(db.String(255))
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
 
-    user = db.relationship("User", back_populates="plans")
-    career = db.relationship("Career", back_populates="plans")
-    steps = db.relationship("PlanStep", back_populates="plan", cascade="all, delete-orphan", order_by="PlanStep.sort_order")
+    # a plan is always rendered with its owner, career and steps: load them with the plan
+    user = db.relationship("User", back_populates="plans", lazy="joined")
+    career = db.relationship("Career", back_populates="plans", lazy="joined")
+    steps = db.relationship("PlanStep", back_populates="plan", cascade="all, delete-orphan", order_by="PlanStep.sort_order", lazy="selectin")
 
 
 class PlanStep(db.Model):
     __tablename__ = 'plan_steps'
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    plan_id = db.Column(db.Integer, db.ForeignKey('plans.id'), nullable=False)
+    plan_id = db.Column(db.Integer, db.ForeignKey('plans.id'), nullable=False, index=True)
     title = db.Column(db.String(255))
     description = db.Column(db.Text)
     sort_order = db.Column(db.Integer, default=0)
@@ -127,17 +157,32 @@ class PlanStep(db.Model):
 class Resource(db.Model):
     __tablename__ = 'resources'
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    career_id = db.Column(db.Integer, db.ForeignKey('careers.id'), nullable=True)
-    title = db.Column(db.String(255), nullable=False)
+    career_id = db.Column(db.Integer, db.ForeignKey('careers.id'), nullable=True, index=True)
+    title = db.Column(db.String(255), nullable=False, index=True)  # seed_db looks resources up by title
     url = db.Column(db.String(2000))
     type = db.Column(db.String(50))  # e.g., book, course, video
 
     # portable JSON column (works with SQLite and Postgres)
     metadata_json = db.Column(db.JSON, nullable=True)
 
-    # tags can be stored as JSON list (portable across SQLite/Postgres)
-    tags = db.Column(db.JSON, nullable=True)
-
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
 
     career = db.relationship("Career", back_populates="resources")
+    # tags live in resource_tags (one row per tag) so "resources tagged X" is an index lookup
+    tag_rows = db.relationship("ResourceTag", back_populates="resource", cascade="all, delete-orphan", lazy="selectin")
+
+    @property
+    def tags(self):
+        return [t.tag for t in self.tag_rows]
+
+
+class ResourceTag(db.Model):
+    __tablename__ = 'resource_tags'
+    resource_id = db.Column(db.Integer, db.ForeignKey('resources.id'), primary_key=True)
+    tag = db.Column(db.String(64), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_tag_resource', 'tag', 'resource_id'),
+    )
+
+    resource = db.relationship("Resource", back_populates="tag_rows")
@@ -1,8 +1,12 @@
 # recommender.py
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
+from functools import lru_cache
+from typing import NamedTuple
+
+# optional: pip install pyahocorasick (C automaton for finding keys inside an interest)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # very small mapping of interest -> career & required skills
 CAREER_MAP = {
@@ -12,37 +16,84 @@ CAREER_MAP = {
     'design': {'career': 'UI/UX Designer', 'skills': ['design-principles', 'figma', 'portfolio']}
 }
 
+class CareerRec(NamedTuple):
+    key: str
+    career: str
+    skills: frozenset
+    entry: dict  # the CAREER_MAP dict handed back by get_recommendations
+
+# CAREER_MAP compiled once at import: immutable records with the skill set already built
+CAREERS = tuple(CareerRec(k, v['career'], frozenset(v['skills']), v) for k, v in CAREER_MAP.items())
+_REC_BY_KEY = {r.key: r for r in CAREERS}
+
+# lookups precomputed once at import so matching is hashing, not nested substring loops
+_KEY_ORDER = {k: i for i, k in enumerate(CAREER_MAP)}
+_KEY_LENGTHS = sorted({len(k) for k in CAREER_MAP})
+# every substring of every key -> keys containing it (answers `key in k` in one lookup)
+_KEY_SUBSTRINGS = {}
+for _k in CAREER_MAP:
+    for _i in range(len(_k) + 1):
+        for _j in range(_i, len(_k) + 1):
+            _KEY_SUBSTRINGS.setdefault(_k[_i:_j], set()).add(_k)
+# all keys in one automaton: `k in key` becomes a single scan of the interest string
+if ahocorasick is not None:
+    _KEY_AUTOMATON = ahocorasick.Automaton()
+    for _k in CAREER_MAP:
+        _KEY_AUTOMATON.add_word(_k, _k)
+    _KEY_AUTOMATON.make_automaton()
+else:
+    _KEY_AUTOMATON = None
+
+def _matching_keys(key):
+    # CAREER_MAP keys k with `k in key or key in k`, in CAREER_MAP order
+    found = set(_KEY_SUBSTRINGS.get(key, ()))
+    if _KEY_AUTOMATON is not None:
+        found.update(k for _, k in _KEY_AUTOMATON.iter(key))
+        return sorted(found, key=_KEY_ORDER.__getitem__)
+    for n in _KEY_LENGTHS:
+        for i in range(len(key) - n + 1):
+            if key[i:i + n] in CAREER_MAP:
+                found.add(key[i:i + n])
+    return sorted(found, key=_KEY_ORDER.__getitem__)
+
+# Both public functions are pure, so results are memoized on normalized, hashable keys.
+# Interest order is kept in the key because it decides the order of the recommendations.
+@lru_cache(maxsize=2048)
+def _recs_cached(interest_keys):
+    # dedupe by career, keeping the first match in interest order
+    out = {}
+    for key in interest_keys:
+        for k in _matching_keys(key):
+            rec = _REC_BY_KEY[k]
+            out.setdefault(rec.career, rec.entry)
+    return tuple(out.values())
+
 def get_recommendations(interests, skills):
-    recs = []
-    for it in interests:
-        key = it.lower().strip()
-        for k in CAREER_MAP:
-            if k in key or key in k:
-                recs.append(CAREER_MAP[k])
-    # dedupe
-    seen = set()
-    out = []
-    for r in recs:
-        if r['career'] not in seen:
-            out.append(r)
-            seen.add(r['career'])
+    recs = _recs_cached(tuple(it.lower().strip() for it in interests))
     # fallback if empty
-    if not out:
-        out = [{'career': 'General Counseling',
-                'skills': ['communication', 'career-planning']}]
-    return out
+    if not recs:
+        return [{'career': 'General Counseling',
+                 'skills': ['communication', 'career-planning']}]
+    return list(recs)
+
+@lru_cache(maxsize=2048)
+def _gap_cached(recs_key, user):
+    return tuple((career, tuple(required - user)) for career, required in recs_key)
 
 def skill_gap(recs, user_skills):
-    user = set([s.lower().strip() for s in user_skills])
-    gaps = {}
-    for r in recs:
-        required = set(r['skills'])
-        missing = list(required - user)
-        gaps[r['career']] = missing
-    return gaps
+    user = frozenset(s.lower().strip() for s in user_skills)
+    # keyed on the recs' contents (not identity), so an edited rec gives the same answer as a copy
+    recs_key = tuple((r['career'], frozenset(r['skills'])) for r in recs)
+    # fresh lists per call so callers can't mutate the cached result
+    return {career: list(missing) for career, missing in _gap_cached(recs_key, user)}
 
 # Pretty console output if run directly
 if __name__ == "__main__":
+    # rich is only needed for this demo; keep it out of the web app's import graph
+    from rich.console import Console
+    from rich.table import Table
+    from rich.panel import Panel
+
     console = Console()
 
     console.print(Panel.fit("[bold cyan]Career Adviser Recommender[/bold cyan]", border_style="blue"))
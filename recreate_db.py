@@ -1,36 +1,13 @@
 # recreate_db.py
 import os
-import shutil
-import time
+import sqlite3
 from datetime import datetime
-from app import app   # ensure this import doesn't auto-start the server (your app should only create the app object)
+from app import app, init_db   # ensure this import doesn't auto-start the server (your app should only create the app object)
 from models import db
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "data.sqlite")
 
-def try_copy_with_retries(src, dst, retries=5, wait=1.0):
-    for attempt in range(1, retries + 1):
-        try:
-            shutil.copy2(src, dst)
-            return True
-        except PermissionError:
-            print(f"[{attempt}/{retries}] PermissionError while copying {src} -> {dst}. File may be locked. Retrying in {wait}s...")
-            time.sleep(wait)
-    return False
-
-def try_remove_with_retries(path, retries=5, wait=1.0):
-    for attempt in range(1, retries + 1):
-        try:
-            os.remove(path)
-            return True
-        except PermissionError:
-            print(f"[{attempt}/{retries}] PermissionError while removing {path}. Retrying in {wait}s...")
-            time.sleep(wait)
-        except FileNotFoundError:
-            return True
-    return False
-
 def backup_db(path):
     if not os.path.exists(path):
         print("No existing DB to back up.")
@@ -38,18 +15,23 @@ def backup_db(path):
 
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     bak = path + f".bak.{ts}"
-    print(f"Attempting to copy {path} -> {bak} (safe copy)...")
-    ok = try_copy_with_retries(path, bak, retries=6, wait=1.0)
-    if not ok:
-        print("Could not copy the DB file (likely locked).")
+    print(f"Backing up {path} -> {bak} (SQLite online backup)...")
+    # page-level copy done by SQLite itself: includes anything still in the WAL,
+    # and sleeps/retries on busy pages instead of failing on a locked file
+    src = sqlite3.connect(path, timeout=30)
+    dst = sqlite3.connect(bak)
+    try:
+        with dst:
+            src.backup(dst, pages=1024, sleep=0.050)
+    except sqlite3.OperationalError as e:
+        print("Could not back up the DB:", e)
         print("Please: stop the Flask server, close DB tools, restart Spyder kernel, then re-run this script.")
         raise SystemExit(1)
-    # try to remove original (optional)
-    removed = try_remove_with_retries(path, retries=6, wait=1.0)
-    if removed:
-        print("Original DB removed after backup.")
-    else:
-        print("Original DB could not be removed after backup (left in place).")
+    finally:
+        src.close()
+        dst.close()
+    # the original stays in place: recreate() drops its tables, and deleting the
+    # file could leave a stale -wal/-shm pair behind for the new database
     return bak
 
 def recreate():
@@ -60,11 +42,11 @@ def recreate():
         except Exception as e:
             print("drop_all() error (can be ignored if starting fresh):", e)
         print("Creating all tables from models...")
-        db.create_all()
+        init_db()
         print("Done. New DB created at:", DB_PATH)
 
 if __name__ == "__main__":
-    # Attempt backup first (copy). If file locked, script stops and tells you what to do.
+    # Attempt backup first. If the DB stays locked, script stops and tells you what to do.
     if os.path.exists(DB_PATH):
         backup_db(DB_PATH)
     recreate()
@@ -1,7 +1,7 @@
 # recreate_db_simple.py
 import os
 from models import db
-from app import app  # ensure your app creates/configures SQLALCHEMY_DATABASE_URI
+from app import app, init_db  # ensure your app creates/configures SQLALCHEMY_DATABASE_URI
 
 DB_PATH = os.path.join(os.path.dirname(__file__), 'data.sqlite')
 
@@ -12,7 +12,7 @@ print("Dropping & recreating DB (tables only).")
 with app.app_context():
     # drop all (WARNING: deletes data)
     db.drop_all()
-    # create all tables from models.py
-    db.create_all()
+    # create all tables (plus indexes and the career search index) from models.py
+    init_db()
 
 print("Done. (Tables recreated)")
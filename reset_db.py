@@ -1,8 +1,7 @@
 # reset_db.py
-from app import app, db
+from app import app, reset_db
 
-# drop and recreate all tables safely
+# empty all tables (schema is only dropped & recreated if models.py changed)
 with app.app_context():
-    db.drop_all()
-    db.create_all()
+    reset_db()
     print("✅ Database has been reset successfully!")
@@ -1,4 +1,5 @@
 @echo off
 cd /d "%~dp0"
+set FLASK_ENV=development
 python app.py
 pause
@@ -5,69 +5,45 @@ Seed the database with careers, skills, requirements, and a few resources.
 Run from the project folder (same place as app.py):
   - Terminal/CMD:   python seed_db.py
   - Spyder IPython: %run seed_db.py
-Add --reset to drop & recreate tables first:
+Add --reset to empty the tables first (schema rebuilt on the first reset and after models.py changes):
   - python seed_db.py --reset
   - %run seed_db.py --reset
 """
 import sys
-from app import app, db
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app import app, db, init_db, reset_db
 from models import Skill, Career, CareerSkillRequirement
 
 # Try to import Resource if it exists in your models
 try:
-    from models import Resource
+    from models import Resource, ResourceTag
     HAVE_RESOURCE = True
 except Exception:
     HAVE_RESOURCE = False
 
 # ---------- helpers ----------
-def get_or_create_skill(name, desc=None):
-    s = Skill.query.filter_by(name=name).first()
-    if not s:
-        s = Skill(name=name, description=desc)
-        db.session.add(s)
-        db.session.flush()
-    return s
-
-def get_or_create_career(title, overview=None):
-    c = Career.query.filter_by(title=title).first()
-    if not c:
-        # your model uses `overview` (earlier) – if not, just title is fine
-        try:
-            c = Career(title=title, overview=overview)
-        except TypeError:
-            c = Career(title=title)
-        db.session.add(c)
-        db.session.flush()
-    return c
-
-def ensure_req(career, skill, importance=1.0, level=None, notes=None):
-    exists = CareerSkillRequirement.query.filter_by(
-        career_id=career.id, skill_id=skill.id
-    ).first()
-    if not exists:
-        try:
-            db.session.add(CareerSkillRequirement(
-                career_id=career.id,
-                skill_id=skill.id,
-                importance=importance,
-                level=level,
-                notes=notes
-            ))
-        except TypeError:
-            # if your CSR model only has (career_id, skill_id)
-            db.session.add(CareerSkillRequirement(
-                career_id=career.id, skill_id=skill.id
-            ))
+def ensure_req(career_id, skill_id, existing, staged):
+    """Stage a career_skills row unless the (career, skill) pair is already in `existing`.
+
+    `existing` is loaded once by the caller, so this never hits the database;
+    staged rows are written together with bulk_insert_mappings.
+    """
+    pair = (career_id, skill_id)
+    if pair in existing:
+        return
+    existing.add(pair)
+    # the CSR model only has (career_id, skill_id); importance/level are not stored
+    staged.append({"career_id": career_id, "skill_id": skill_id})
 
 def add_resource_safe(title, url=None, rtype=None, provider=None, description=None):
-    """Create Resource if model exists and supports these fields."""
+    """Create Resource if model exists and supports these fields.
+
+    Create-only: main() already looked the title up in its preloaded resource map.
+    """
     if not HAVE_RESOURCE:
         return None
-    # find existing by title
-    r = Resource.query.filter_by(title=title).first()
-    if r:
-        return r
     # be tolerant to model signature differences
     try:
         r = Resource(title=title, url=url, resource_type=rtype,
@@ -178,39 +154,88 @@ RESOURCES = [
 def main(reset=False):
     with app.app_context():
         if reset:
-            db.drop_all()
-            db.create_all()
-
-        # skills
-        for sk in SKILLS:
-            get_or_create_skill(sk)
-        db.session.commit()
-
-        # careers + requirements
-        for title, reqs in CAREERS.items():
-            c = get_or_create_career(title)
-            for (skill_name, importance, level) in reqs:
-                s = get_or_create_skill(skill_name)
-                ensure_req(c, s, importance=importance, level=level)
-        db.session.commit()
-
-        # resources (if your Resource model exists)
-        if HAVE_RESOURCE:
-            for title, url, rtype, provider, skill_names, career_titles in RESOURCES:
-                r = add_resource_safe(title, url, rtype, provider)
-                for sn in skill_names:
-                    s = get_or_create_skill(sn)
-                    link_resource_to_skill(r, s)
-                for ct in career_titles:
-                    c = get_or_create_career(ct)
-                    link_resource_to_career(r, c)
-            db.session.commit()
+            reset_db()  # DELETEs rows; drop & recreate only if the schema changed
+        init_db()  # tables, indexes, search index (no longer done on app import)
+
+        # all seed writes in one transaction: one commit (and one WAL sync) per run
+        with db.session.begin():
+            # skills and careers: one SELECT of what exists, one executemany for what is
+            # missing, then one SELECT for the name -> id map (no add + flush per object)
+            def skill_id_map():
+                return dict(db.session.execute(db.select(Skill.name, Skill.id)).all())
+
+            def career_id_map():
+                # ordered so the lowest id wins if a title is duplicated (same as .first())
+                return dict(db.session.execute(db.select(Career.title, Career.id).order_by(Career.id.desc())).all())
+
+            skill_ids = skill_id_map()
+            missing = [n for n in dict.fromkeys(
+                SKILLS
+                + [sn for reqs in CAREERS.values() for (sn, _, _) in reqs]
+                + [sn for r in RESOURCES for sn in r[4]]
+            ) if n not in skill_ids]
+            if missing:
+                db.session.bulk_insert_mappings(Skill, [{"name": n} for n in missing])
+                skill_ids = skill_id_map()
+
+            career_ids = career_id_map()
+            missing = [t for t in dict.fromkeys(list(CAREERS) + [ct for r in RESOURCES for ct in r[5]])
+                       if t not in career_ids]
+            if missing:
+                db.session.bulk_insert_mappings(Career, [{"title": t} for t in missing])
+                career_ids = career_id_map()
+
+            # requirements: one SELECT of existing pairs, membership checked in memory,
+            # missing rows written with a single executemany
+            existing = set(db.session.execute(
+                db.select(CareerSkillRequirement.career_id, CareerSkillRequirement.skill_id)
+            ).all())
+            staged = []
+            for title, reqs in CAREERS.items():
+                for (skill_name, importance, level) in reqs:
+                    ensure_req(career_ids[title], skill_ids[skill_name], existing, staged)
+            if staged:
+                db.session.bulk_insert_mappings(CareerSkillRequirement, staged)
+
+            # resources (if your Resource model exists)
+            if HAVE_RESOURCE:
+                # only link through relationships the Resource model actually has, and load
+                # those collections with the resources (one SELECT, not a lazy load per check)
+                link_rels = [rel for rel in ("skills", "careers") if hasattr(Resource, rel)]
+                resources = {r.title: r for r in db.session.scalars(
+                    select(Resource)
+                    .options(*(selectinload(getattr(Resource, rel)) for rel in link_rels))
+                    .order_by(Resource.id.desc())  # lowest id wins for a duplicated title
+                )}
+                if "skills" in link_rels:
+                    skills = {s.name: s for s in db.session.scalars(select(Skill))}
+                if "careers" in link_rels:
+                    careers = {c.id: c for c in db.session.scalars(select(Career))}
+
+                tag_rows = []
+                for title, url, rtype, provider, skill_names, career_titles in RESOURCES:
+                    r = resources.get(title) or add_resource_safe(title, url, rtype, provider)
+                    # a resource is tagged with the skills it teaches
+                    tag_rows.extend({"resource_id": r.id, "tag": sn} for sn in skill_names)
+                    if "skills" in link_rels:
+                        for sn in skill_names:
+                            link_resource_to_skill(r, skills[sn])
+                    if "careers" in link_rels:
+                        for ct in career_titles:
+                            link_resource_to_career(r, careers[career_ids[ct]])
+                db.session.execute(
+                    sqlite_insert(ResourceTag.__table__).on_conflict_do_nothing(),
+                    tag_rows,
+                )
 
         # summary
         from sqlalchemy import func
-        career_count = db.session.query(func.count(Career.id)).scalar()
-        skill_count = db.session.query(func.count(Skill.id)).scalar()
-        req_count = db.session.query(func.count(CareerSkillRequirement.id)).scalar()
+        # one SELECT of three scalar subqueries instead of a round-trip per count
+        career_count, skill_count, req_count = db.session.execute(db.select(
+            db.select(func.count()).select_from(Career).scalar_subquery(),
+            db.select(func.count()).select_from(Skill).scalar_subquery(),
+            db.select(func.count()).select_from(CareerSkillRequirement).scalar_subquery(),
+        )).one()
         print(f"✅ Seed complete: {career_count} careers, {skill_count} skills, {req_count} requirements.")
         if HAVE_RESOURCE:
             print("   Resources also added.")
@@ -1,14 +1,41 @@
 # check_schema.py
 import sqlite3
 import os
+from functools import lru_cache
 
 DB = os.path.join(os.path.dirname(__file__), "data.sqlite")
-print("DB:", DB)
-con = sqlite3.connect(DB)
-cur = con.cursor()
-cur.execute("PRAGMA table_info(users);")
-print("users table columns:")
-for row in cur.fetchall():
-    print(row)
-cur.close()
-con.close()
+
+
+@lru_cache(maxsize=None)
+def _connect():
+    # one read-only connection per process instead of open/close per check
+    return sqlite3.connect("file:" + DB + "?mode=ro", uri=True)
+
+
+def schema():
+    """Return {table: ((cid, name, type, notnull, dflt_value, pk, hidden), ...)} for every table.
+
+    One query over sqlite_master joined to pragma_table_xinfo (which, unlike
+    table_info, also lists hidden/generated columns).
+    """
+    rows = _connect().execute(
+        "SELECT m.name, p.cid, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk, p.hidden "
+        "FROM sqlite_master m JOIN pragma_table_xinfo(m.name) p "
+        "WHERE m.type = 'table' ORDER BY m.name, p.cid"
+    ).fetchall()
+    tables = {}
+    for table, *col in rows:
+        tables.setdefault(table, []).append(tuple(col))
+    return {t: tuple(cols) for t, cols in tables.items()}
+
+
+def table_columns(table):
+    """Columns of a single table, as returned by PRAGMA table_xinfo."""
+    return tuple(_connect().execute("SELECT * FROM pragma_table_xinfo(?)", (table,)).fetchall())
+
+
+if __name__ == "__main__":
+    print("DB:", DB)
+    print("users table columns:")
+    for row in table_columns("users"):
+        print(row)
@@ -0,0 +1,6 @@
+# wsgi.py
+# WSGI entrypoint for production servers, e.g.:
+#   gunicorn -c gunicorn_conf.py wsgi:app
+from app import app
+
+__all__ = ['app']